@@ -0,0 +1,362 @@
+"""
+Benchmark de carga da API DockSaaS.
+
+Roda o app FastAPI em processo (TestClient) contra um arquivo SQLite
+temporário, um cliente Docker falso com latência configurável e um backend
+falso para os comandos de armazenamento (fallocate, mkfs.ext4, mount, df...).
+Nada é criado no Docker real nem em /mnt ou /var/lib.
+
+Para cada escala o banco é semeado com N usuários, N volumes e N containers e
+em seguida são medidas as operações da API. A saída é JSON com percentis de
+latência e vazão por operação, para comparar resultados entre execuções.
+
+Uso:
+    python benchmark.py
+    python benchmark.py --entidades 100 1000 --ops 100 --saida resultado.json
+    python benchmark.py --latencia-docker-ms 5 --latencia-storage-ms 2
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timezone
+
+import docker
+import docker.errors
+
+
+# ------------------------------------------------------
+# Cliente Docker falso
+# ------------------------------------------------------
+class FakeContainer:
+    def __init__(self, client, name):
+        self.client = client
+        self.id = uuid.uuid4().hex + uuid.uuid4().hex
+        self.name = name
+        self.status = "running"
+
+    def start(self):
+        self.client.esperar()
+        self.status = "running"
+
+    def stop(self):
+        self.client.esperar()
+        self.status = "exited"
+
+    def remove(self):
+        self.client.esperar()
+        self.client.containers.descartar(self)
+
+
+class FakeContainers:
+    def __init__(self, client):
+        self.client = client
+        self.por_id = {}
+        self.por_nome = {}
+
+    def registrar(self, name):
+        container = FakeContainer(self.client, name)
+        self.por_id[container.id] = container
+        self.por_nome[name] = container
+        return container
+
+    def descartar(self, container):
+        self.por_id.pop(container.id, None)
+        if self.por_nome.get(container.name) is container:
+            del self.por_nome[container.name]
+
+    def run(self, image, name=None, environment=None, ports=None, volumes=None, detach=False):
+        self.client.esperar()
+        return self.registrar(name or uuid.uuid4().hex[:12])
+
+    def get(self, container_id):
+        self.client.esperar()
+        container = self.por_id.get(container_id) or self.por_nome.get(container_id)
+        if container is None:
+            raise docker.errors.NotFound(f"No such container: {container_id}")
+        return container
+
+
+class FakeVolume:
+    def __init__(self, client, name):
+        self.client = client
+        self.name = name
+
+    def remove(self, force=False):
+        self.client.esperar()
+        self.client.volumes.por_nome.pop(self.name, None)
+
+
+class FakeVolumes:
+    def __init__(self, client):
+        self.client = client
+        self.por_nome = {}
+
+    def create(self, name=None, driver=None, driver_opts=None):
+        self.client.esperar()
+        volume = FakeVolume(self.client, name)
+        self.por_nome[name] = volume
+        return volume
+
+    def get(self, name):
+        self.client.esperar()
+        volume = self.por_nome.get(name)
+        if volume is None:
+            raise docker.errors.NotFound(f"No such volume: {name}")
+        return volume
+
+
+class FakeDockerClient:
+    def __init__(self, latencia_ms=0.0):
+        self.latencia = latencia_ms / 1000.0
+        self.containers = FakeContainers(self)
+        self.volumes = FakeVolumes(self)
+
+    def esperar(self):
+        if self.latencia:
+            time.sleep(self.latencia)
+
+
+# ------------------------------------------------------
+# Backend falso de comandos de armazenamento
+# Substitui o módulo subprocess usado pelo VolumeManager
+# ------------------------------------------------------
+class FakeStorage:
+    PIPE = subprocess.PIPE
+
+    def __init__(self, mount_dir, latencia_ms=0.0, uso_mb=10, total_mb=1024):
+        self.mount_dir = mount_dir
+        self.latencia = latencia_ms / 1000.0
+        self.uso_mb = uso_mb
+        self.total_mb = total_mb
+
+    def run(self, cmd, stdout=None, text=False, check=False, **kwargs):
+        if self.latencia:
+            time.sleep(self.latencia)
+
+        saida = ""
+        programa = cmd[0]
+        if programa == "df":
+            livre = self.total_mb - self.uso_mb
+            perc = f"{self.uso_mb * 100 // self.total_mb}%"
+            saida = (
+                "Filesystem 1M-blocks Used Available Use% Mounted on\n"
+                f"/dev/loop0 {self.total_mb} {self.uso_mb} {livre} {perc} {cmd[-1]}\n"
+            )
+        elif programa == "fallocate" and not cmd[2].startswith("+"):
+            open(cmd[3], "a").close()
+        elif programa == "umount":
+            self._esvaziar(cmd[1])
+
+        return subprocess.CompletedProcess(cmd, 0, stdout=saida, stderr="")
+
+    def _esvaziar(self, mount_path):
+        # O conteúdo "vive" na imagem: ao desmontar, o ponto de montagem fica vazio
+        if not os.path.isdir(mount_path) or not mount_path.startswith(self.mount_dir):
+            return
+        for nome in os.listdir(mount_path):
+            caminho = os.path.join(mount_path, nome)
+            if os.path.isdir(caminho):
+                shutil.rmtree(caminho)
+            else:
+                os.remove(caminho)
+
+
+# ------------------------------------------------------
+# Estatísticas
+# ------------------------------------------------------
+def percentil(ordenados, p):
+    if not ordenados:
+        return 0.0
+    idx = max(0, min(len(ordenados) - 1, int(round(p / 100.0 * len(ordenados))) - 1))
+    return ordenados[idx]
+
+
+def resumir(latencias, erros):
+    ordenados = sorted(latencias)
+    total = sum(ordenados)
+    return {
+        "requisicoes": len(ordenados),
+        "erros": erros,
+        "total_s": round(total, 6),
+        "vazao_ops_s": round(len(ordenados) / total, 2) if total else 0.0,
+        "media_ms": round(total / len(ordenados) * 1000, 3) if ordenados else 0.0,
+        "p50_ms": round(percentil(ordenados, 50) * 1000, 3),
+        "p90_ms": round(percentil(ordenados, 90) * 1000, 3),
+        "p95_ms": round(percentil(ordenados, 95) * 1000, 3),
+        "p99_ms": round(percentil(ordenados, 99) * 1000, 3),
+        "max_ms": round(ordenados[-1] * 1000, 3) if ordenados else 0.0,
+    }
+
+
+def medir(client, metodo, urls):
+    latencias = []
+    erros = 0
+    respostas = []
+    for url in urls:
+        inicio = time.perf_counter()
+        resp = client.request(metodo, url)
+        latencias.append(time.perf_counter() - inicio)
+        if resp.status_code >= 400:
+            erros += 1
+        respostas.append(resp)
+    return resumir(latencias, erros), respostas
+
+
+# ------------------------------------------------------
+# Semeadura direta no SQLite (fora da medição)
+# ------------------------------------------------------
+def semear(db, docker_client, mount_dir, n):
+    usuarios = [(f"seed_{i}", "user", 1024) for i in range(n)]
+    volumes = [(f"seed_{i}_vol", f"seed_{i}", os.path.join(mount_dir, f"seed_{i}_vol"), 1024) for i in range(n)]
+    containers = []
+    for i in range(n):
+        docker_client.volumes.por_nome[f"seed_{i}_vol"] = FakeVolume(docker_client, f"seed_{i}_vol")
+        container = docker_client.containers.registrar(f"seed_{i}_mysql")
+        # Portas fora da faixa do _generate_port para não esgotá-la em escalas grandes;
+        # o custo medido (varrer todas as portas existentes) é o mesmo.
+        containers.append((container.id, f"seed_{i}", "mysql", "root", "senha", 60001 + i))
+
+    db.cursor.executemany("INSERT INTO users (username, level, storage_limit_mb) VALUES (?, ?, ?)", usuarios)
+    db.cursor.executemany("INSERT INTO volumes (name, usuario_responsavel, path, limite_mb) VALUES (?, ?, ?, ?)", volumes)
+    db.cursor.executemany(
+        "INSERT INTO containers (container_name, usuario, tipodb, loginroot, password, porta) VALUES (?, ?, ?, ?, ?, ?)",
+        containers
+    )
+    db.conn.commit()
+    return [c[0] for c in containers]
+
+
+# ------------------------------------------------------
+# Execução de uma escala
+# ------------------------------------------------------
+def executar_escala(main, n, args):
+    import volume_manager as vm_module
+    from database import Sqlite
+    from volume_manager import VolumeManager
+    from container_manager import ContainerManager
+    from fastapi.testclient import TestClient
+
+    random.seed(args.seed)
+    tmp = tempfile.mkdtemp(prefix=f"docksaas_bench_{n}_")
+    mount_dir = os.path.join(tmp, "mnt")
+    os.makedirs(mount_dir)
+
+    docker_client = FakeDockerClient(args.latencia_docker_ms)
+    docker.from_env = lambda: docker_client
+    vm_module.subprocess = FakeStorage(mount_dir, args.latencia_storage_ms)
+
+    db = Sqlite(os.path.join(tmp, "saas.db"))
+    main.db = db
+    main.volume_manager = VolumeManager(os.path.join(tmp, "imgs"), db, mount_dir)
+    main.container_manager = ContainerManager(main.volume_manager, db)
+
+    try:
+        inicio = time.perf_counter()
+        seed_ids = semear(db, docker_client, mount_dir, n)
+        semeadura = time.perf_counter() - inicio
+
+        ops = args.ops
+        novos = [f"bench_{i}" for i in range(ops)]
+        resultado = {}
+
+        with TestClient(main.app) as client:
+            resultado["usuarios_criar"], _ = medir(
+                client, "POST", [f"/usuarios/criar?username={u}" for u in novos])
+
+            tipos = ["mysql", "postgres"]
+            resultado["containers_criar"], respostas = medir(
+                client, "POST",
+                [f"/containers/criar?usuario={u}&tipodb={tipos[i % 2]}" for i, u in enumerate(novos)])
+
+            novos_ids = []
+            for resp in respostas:
+                if resp.status_code < 400:
+                    nome = resp.json()["dados"]["container_name"]
+                    novos_ids.append(docker_client.containers.por_nome[nome].id)
+
+            resultado["containers_iniciar"], _ = medir(
+                client, "POST", [f"/containers/{cid}/iniciar" for cid in novos_ids])
+            resultado["containers_parar"], _ = medir(
+                client, "POST", [f"/containers/{cid}/parar" for cid in novos_ids])
+            resultado["containers_remover"], _ = medir(
+                client, "DELETE", [f"/containers/{cid}" for cid in seed_ids[:ops]])
+
+            # Cada usuário novo ainda possui seu container e volume
+            resultado["usuarios_deletar"], _ = medir(
+                client, "DELETE", [f"/usuarios/{u}" for u in novos])
+
+            resultado["volumes_espaco"], _ = medir(
+                client, "GET", ["/volumes/espaco"] * args.repeticoes_espaco)
+
+        return {"entidades": n, "semeadura_s": round(semeadura, 3), "operacoes": resultado}
+    finally:
+        db.conn.close()
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="Benchmark de carga da API DockSaaS")
+    parser.add_argument("--entidades", type=int, nargs="+", default=[100, 1000, 10000, 100000],
+                        help="quantidade de usuários/volumes/containers semeados em cada escala")
+    parser.add_argument("--ops", type=int, default=200, help="requisições medidas por operação")
+    parser.add_argument("--repeticoes-espaco", type=int, default=3, help="chamadas medidas de /volumes/espaco")
+    parser.add_argument("--latencia-docker-ms", type=float, default=0.0, help="latência por chamada ao Docker falso")
+    parser.add_argument("--latencia-storage-ms", type=float, default=0.0, help="latência por comando de armazenamento")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--log-level", default="WARNING")
+    parser.add_argument("--saida", help="arquivo JSON de saída (padrão: stdout)")
+    args = parser.parse_args()
+
+    # Importar o app sem tocar no Docker real nem em /var/lib ou /mnt
+    bootstrap = tempfile.mkdtemp(prefix="docksaas_bench_")
+    os.environ["DOCKSAAS_DB"] = os.path.join(bootstrap, "saas.db")
+    os.environ["DOCKSAAS_IMG_DIR"] = os.path.join(bootstrap, "imgs")
+    os.environ["DOCKSAAS_MOUNT_DIR"] = os.path.join(bootstrap, "mnt")
+    docker.from_env = lambda: FakeDockerClient()
+    import main
+    bootstrap_db = main.db
+
+    logging.getLogger().setLevel(args.log_level.upper())
+
+    try:
+        resultados = []
+        for n in args.entidades:
+            logging.warning(f"Executando escala com {n} entidades...")
+            resultados.append(executar_escala(main, n, args))
+    finally:
+        bootstrap_db.conn.close()
+        shutil.rmtree(bootstrap, ignore_errors=True)
+
+    relatorio = {
+        "meta": {
+            "data": datetime.now(timezone.utc).isoformat(),
+            "python": sys.version.split()[0],
+            "plataforma": platform.platform(),
+            "ops": args.ops,
+            "repeticoes_espaco": args.repeticoes_espaco,
+            "latencia_docker_ms": args.latencia_docker_ms,
+            "latencia_storage_ms": args.latencia_storage_ms,
+            "seed": args.seed,
+        },
+        "resultados": resultados,
+    }
+
+    saida = json.dumps(relatorio, indent=2, ensure_ascii=False)
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as f:
+            f.write(saida + "\n")
+    else:
+        print(saida)
+
+
+if __name__ == "__main__":
+    main_cli()
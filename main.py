@@ -4,14 +4,19 @@ from database import Sqlite
 from volume_manager import VolumeManager
 from container_manager import ContainerManager
 import logging
+import os
 
 logging.basicConfig(level=logging.INFO)
 
 app = FastAPI(title="🐳 Docker + SQLite Manager API", version="1.0")
 
-# Instâncias globais
-db = Sqlite()
-volume_manager = VolumeManager("/var/lib/docker-imgs", db)
+# Instâncias globais (caminhos podem ser sobrescritos por variáveis de ambiente)
+db = Sqlite(os.environ.get("DOCKSAAS_DB", "saas.db"))
+volume_manager = VolumeManager(
+    os.environ.get("DOCKSAAS_IMG_DIR", "/var/lib/docker-imgs"),
+    db,
+    os.environ.get("DOCKSAAS_MOUNT_DIR", "/mnt")
+)
 container_manager = ContainerManager(volume_manager, db)
 
 # ---------------------------------
@@ -53,7 +58,7 @@ def deletar_usuario(username: str):
         # remove containers do usuário
         containers = [c for c in db.list_containers() if c["usuario"] == username]
         for c in containers:
-            container_manager.remove_container(c["id"])
+            container_manager.remove_container(c["container_name"])
 
         # remove volumes
         volume_manager.on_user_deleted(username)
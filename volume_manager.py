@@ -9,10 +9,11 @@ logging.basicConfig(level=logging.INFO)
 
 
 class VolumeManager:
-    def __init__(self, base_dir="/var/lib/docker-imgs", db=None):
+    def __init__(self, base_dir="/var/lib/docker-imgs", db=None, mount_dir="/mnt"):
         self.client = docker.from_env()
         self.db = db
         self.base_dir = base_dir
+        self.mount_dir = mount_dir
         if(db == None):
             logging.error(f"Erro ao acesar banco de dados!")
         os.makedirs(self.base_dir, exist_ok=True)
@@ -27,7 +28,7 @@ class VolumeManager:
     def create_user_volume(self, username: str, limite_mb: int):
         volume_name = self._generate_volume_name(username)
         img_path = os.path.join(self.base_dir, f"{volume_name}.img")
-        mount_path = f"/mnt/{volume_name}"
+        mount_path = os.path.join(self.mount_dir, volume_name)
 
         try:
             subprocess.run(["fallocate", "-l", f"{limite_mb}M", img_path], check=True)